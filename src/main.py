@@ -1,49 +1,362 @@
+from __future__ import annotations
+
 import os
 import sys
 import csv
+import json
+import time
+import zlib
+import string
+import random
+import asyncio
+import threading
 import argparse
+import multiprocessing
+import functools
 import base64
 import pathlib
-import markdown2
 import mimetypes
+import urllib.parse
+from email.utils import formataddr, parseaddr
 from pathlib import Path
-from email.message import EmailMessage
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+# markdown2, requests and the google client stack cost hundreds of ms
+# to import; they're pulled in lazily where needed so --help and
+# --dry-run stay snappy
 
 SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
 TOKEN_PATH = "token.json"
 CREDS_PATH = "credentials.json"
+GMAIL_SEND_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages/send"
+
+# the Gmail batch endpoint accepts at most 100 calls per multipart request
+BATCH_SIZE = 100
+
+# fixed multipart boundaries: '-' never occurs in base64 output, so
+# encoded part bodies can't collide with a boundary line
+MIXED_BOUNDARY = "=-automail-mixed-="
+ALT_BOUNDARY = "=-automail-alt-="
+
+# Gmail meters 250 quota units per second per user; one send costs 100
+QUOTA_UNITS_PER_SEC = 250
+SEND_QUOTA_UNITS = 100
+
+
+class TokenBucket:
+    """
+    Blocking token bucket used to pace quota-unit spend client-side,
+    so we stay under the limit instead of discovering it via 429s.
+    """
+
+    def __init__(self, rate_per_sec: float, capacity: float) -> None:
+        self.rate = rate_per_sec
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: float = 1.0) -> None:
+        """
+        Block until ``cost`` tokens are available, then spend them.
+
+        Costs larger than the capacity are allowed (a full batch is
+        BATCH_SIZE × SEND_QUOTA_UNITS): the bucket drains into deficit
+        and later acquires wait it out, so the long-run rate still
+        holds while one burst per refill window goes through.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                needed = min(cost, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= cost
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_bucket = TokenBucket(rate_per_sec=QUOTA_UNITS_PER_SEC, capacity=QUOTA_UNITS_PER_SEC)
+
+
+# one reusable parser – re-instantiating Markdown() per call rebuilds
+# its extension tables every time
+_MD = None
+
+
+@functools.lru_cache(maxsize=1024)
+def _md_to_html(md: str) -> str:
+    """Convert Markdown to HTML, memoized on the filled body text."""
+    global _MD
+    if _MD is None:
+        import markdown2
+
+        _MD = markdown2.Markdown()
+    return _MD.convert(md)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_attachment(path_str: str) -> tuple[bytes, str, str, str]:
+    """
+    Read an attachment once and remember it.
+
+    Returns ``(data, maintype, subtype, filename)``; keyed on the
+    resolved path so the same file attached to every row is read (and
+    MIME-sniffed) exactly once.
+    """
+    p = Path(path_str)
+    ctype, _ = mimetypes.guess_type(p)
+    maintype, subtype = (ctype or "application/octet-stream").split("/", 1)
+    return p.read_bytes(), maintype, subtype, p.name
+
+
+def _disposition(name: str) -> str:
+    """
+    A Content-Disposition header with the filename safely encoded:
+    quoted-string for ASCII names, RFC 2231 (``filename*=``) for the
+    rest, matching what EmailMessage emitted.
+    """
+    _check_header(name)
+    try:
+        name.encode("ascii")
+    except UnicodeEncodeError:
+        quoted = urllib.parse.quote(name, safe="")
+        return f"Content-Disposition: attachment; filename*=utf-8''{quoted}"
+    escaped = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'Content-Disposition: attachment; filename="{escaped}"'
+
+
+@functools.lru_cache(maxsize=64)
+def _attachment_part(path_str: str) -> bytes:
+    """
+    Build the full MIME part for one attachment – headers plus
+    base64-encoded payload – once per unique file.
+    """
+    data, maintype, subtype, name = _load_attachment(path_str)
+    part = bytearray()
+    part += f"--{MIXED_BOUNDARY}\r\n".encode()
+    part += f"Content-Type: {maintype}/{subtype}\r\n".encode()
+    part += b"Content-Transfer-Encoding: base64\r\n"
+    part += f"{_disposition(name)}\r\n\r\n".encode()
+    part += base64.encodebytes(data)
+    part += b"\r\n"
+    return bytes(part)
+
+
+@functools.lru_cache(maxsize=64)
+def _attach_blob(paths: tuple[str, ...]) -> bytes:
+    """
+    The ready-to-splice MIME tail for a set of attachments.
+
+    Keyed on the tuple of resolved paths, so rows sharing the same
+    expanded attachment set reuse one concatenated blob instead of
+    re-joining the parts per message.
+    """
+    return b"".join(_attachment_part(p) for p in paths)
+
+
+def _check_header(value: str) -> str:
+    """
+    Fail closed on CR/LF, like EmailMessage did.
+
+    Filled values come from third-party CSVs; a cell like
+    ``x\\r\\nBcc: ...`` spliced verbatim into the buffer would inject a
+    real header into authenticated outgoing mail.
+    """
+    if "\r" in value or "\n" in value:
+        raise ValueError(f"Header values may not contain newlines: {value!r}")
+    return value
+
+
+def _encode_header(value: str) -> str:
+    """
+    RFC 2047-encode an *unstructured* header value (e.g. Subject) only
+    when it isn't pure ASCII.
+    """
+    _check_header(value)
+    try:
+        value.encode("ascii")
+        return value
+    except UnicodeEncodeError:
+        return "=?utf-8?b?" + base64.b64encode(value.encode()).decode("ascii") + "?="
+
+
+def _encode_addr(value: str) -> str:
+    """
+    Encode a name-addr header value (To/From).
+
+    Only the display name may be RFC 2047-encoded – wrapping the whole
+    value would swallow the address inside the encoded word. formataddr
+    quotes/encodes the name as needed and leaves the addr-spec alone.
+    """
+    _check_header(value)
+    name, addr = parseaddr(value)
+    if not name:
+        return value  # bare address (or unparseable) – pass through
+    return formataddr((name, addr))
+
+
+@functools.lru_cache(maxsize=1)
+def _mime_skeleton(sender: str) -> bytes:
+    """
+    The header/structure bytes shared by every message from ``sender``:
+    From, MIME-Version, the multipart/mixed envelope and the opening of
+    the alternative part. Rendered once per run instead of per row.
+    """
+    return (
+        f"From: {_encode_addr(sender)}\r\n"
+        "MIME-Version: 1.0\r\n"
+        f'Content-Type: multipart/mixed; boundary="{MIXED_BOUNDARY}"\r\n\r\n'
+        f"--{MIXED_BOUNDARY}\r\n"
+        f'Content-Type: multipart/alternative; boundary="{ALT_BOUNDARY}"\r\n\r\n'
+    ).encode()
+
+
+def build_mime(
+    to: str,
+    sender: str,
+    subject: str,
+    plain: str,
+    html: str,
+    attach_blob: bytes = b"",
+) -> bytes:
+    """
+    Serialize one message for our fixed schema: headers, a
+    multipart/alternative (plain + html) wrapped in multipart/mixed,
+    then any pre-rendered attachment parts.
+
+    stdlib's BytesGenerator re-folds headers and consults the policy per
+    line; for our small, fixed layout a straight bytearray is 5-10×
+    faster and lets attachment parts be reused verbatim across rows.
+    """
+    buf = bytearray()
+    buf += f"To: {_encode_addr(to)}\r\n".encode()
+    buf += f"Subject: {_encode_header(subject)}\r\n".encode()
+    buf += _mime_skeleton(sender)
+    for subtype, body in (("plain", plain), ("html", html)):
+        buf += f"--{ALT_BOUNDARY}\r\n".encode()
+        buf += f"Content-Type: text/{subtype}; charset=utf-8\r\n".encode()
+        buf += b"Content-Transfer-Encoding: base64\r\n\r\n"
+        buf += base64.encodebytes(body.encode())
+        buf += b"\r\n"
+    buf += f"--{ALT_BOUNDARY}--\r\n".encode()
+
+    buf += attach_blob
+    buf += f"--{MIXED_BOUNDARY}--\r\n".encode()
+    return bytes(buf)
+
+
+def compile_template(template: str) -> list[tuple]:
+    """
+    Tokenize a {placeholder} template once, up front.
+
+    Returns the ``(literal, field_name, format_spec, conversion)`` tuples
+    from string.Formatter, so per-row filling is a dict lookup per
+    placeholder instead of re-lexing the whole template every time.
+    """
+    return list(string.Formatter().parse(template))
 
 
-def _attach_files(msg: EmailMessage, paths: list[str], row: dict):
-    for tpl in paths:
-        fp = Path(tpl.format(**row))  # expand placeholders
-        if not fp.is_file():
-            print(f"⚠️  attachment {fp} not found – skipping")
+_FORMATTER = string.Formatter()
+
+
+def fill(parts: list[tuple], row: dict) -> str:
+    """
+    Fill a compiled template with values from ``row``.
+
+    Matches .format(**row) semantics: conversions ({x!r}), compound
+    names ({a[b]}, {a.b}) and nested specs ({x:{w}}) all apply; the
+    plain-name common case stays a single dict lookup.
+    """
+    out = []
+    for lit, name, spec, conv in parts:
+        out.append(lit)
+        if name is None:
             continue
+        if "." in name or "[" in name:
+            value = _FORMATTER.get_field(name, (), row)[0]
+        else:
+            value = row[name]
+        if conv:
+            value = _FORMATTER.convert_field(value, conv)
+        if spec and "{" in spec:
+            spec = spec.format_map(row)
+        out.append(format(value, spec or ""))
+    return "".join(out)
 
-        ctype, _ = mimetypes.guess_type(fp)
-        maintype, subtype = (ctype or "application/octet-stream").split("/", 1)
 
-        msg.add_attachment(
-            fp.read_bytes(),
-            maintype=maintype,
-            subtype=subtype,
-            filename=fp.name,
-        )
+def has_fields(parts: list[tuple]) -> bool:
+    """True if a compiled template references any placeholder."""
+    return any(name is not None for _, name, _, _ in parts)
 
 
-def get_service():
+def _iter_rows_fast(csv_path, body_parts: list[tuple]):
+    """
+    Yield ``(row, filled_body)`` pairs via pyarrow.
+
+    read_csv is multithreaded and binary_join_element_wise fills every
+    body in one C++ kernel call, moving the hot fill loop out of Python
+    bytecode entirely. Requires pyarrow; raises ImportError otherwise,
+    and KeyError when the template references a column the CSV lacks.
+    """
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+
+    tbl = pacsv.read_csv(csv_path)
+
+    missing = {n for _, n, _, _ in body_parts if n is not None} - set(tbl.column_names)
+    if missing:
+        raise KeyError(sorted(missing)[0])
+
+    if not has_fields(body_parts):
+        # all-literal template: joining only scalars yields a scalar,
+        # and a constant body doesn't need the join kernel at all
+        body = "".join(lit for lit, _, _, _ in body_parts)
+        return ((row, body) for batch in tbl.to_batches() for row in batch.to_pylist())
+
+    join_args = []
+    for lit, name, _, _ in body_parts:
+        if lit:
+            join_args.append(lit)
+        if name is not None:
+            join_args.append(tbl[name].cast("string"))
+    bodies = pc.binary_join_element_wise(*join_args, "")
+
+    def _iter():
+        # convert one record batch at a time – the table stays columnar
+        # and compact, only the current batch exists as Python dicts
+        offset = 0
+        for batch in tbl.to_batches():
+            rows = batch.to_pylist()
+            yield from zip(rows, bodies.slice(offset, len(rows)).to_pylist())
+            offset += len(rows)
+
+    return _iter()
+
+
+# process-wide credentials; the google-auth objects are safe to share
+# across threads, unlike the discovery client
+_creds = None
+
+
+def get_creds():
     """
-    Return an authenticated Gmail service resource.
+    Run (or resume) the OAuth flow and return valid credentials.
+
+    The result is cached for the life of the process, so repeated calls
+    don't re-read and re-parse token.json.
     """
-    creds = None
-    if os.path.exists(TOKEN_PATH):
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    global _creds
+    if _creds and _creds.valid:
+        return _creds
+
+    creds = _creds
+    if creds is None and os.path.exists(TOKEN_PATH):
         creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
 
     if not creds or not creds.valid:
@@ -52,49 +365,249 @@ def get_service():
         else:
             flow = InstalledAppFlow.from_client_secrets_file(CREDS_PATH, SCOPES)
             creds = flow.run_local_server(port=0)
-        with open(TOKEN_PATH, "w") as f:
+        # write-then-rename so a crash can't leave a torn token.json
+        tmp = TOKEN_PATH + ".tmp"
+        with open(tmp, "w") as f:
             f.write(creds.to_json())
+        os.replace(tmp, TOKEN_PATH)
+
+    _creds = creds
+    return creds
+
+
+@functools.lru_cache(maxsize=1)
+def get_service():
+    """
+    Return an authenticated Gmail service resource (used for batching).
+    """
+    from googleapiclient.discovery import build
+
+    return build("gmail", "v1", credentials=get_creds())
+
+
+def get_session() -> AuthorizedSession:
+    """
+    Return an authenticated requests session with a connection pool.
 
-    return build("gmail", "v1", credentials=creds)
+    Keep-alive amortizes the TCP + TLS handshake across sends – without
+    it, concurrent per-message requests each pay ~100 ms of setup.
+    """
+    import requests
+    from google.auth.transport.requests import AuthorizedSession
+
+    session = AuthorizedSession(get_creds())
+    adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20)
+    session.mount("https://", adapter)
+    return session
 
 
 def create_message(
     row: dict,
-    subject_fmt: str,
-    body_template: str,
+    subject: str,
+    body: str,
     sender: str,
     attachments=None,
 ) -> dict:
     """
     Create a MIME e‑mail and wrap it for the Gmail API.
+
+    ``subject`` and the Markdown ``body`` are already resolved by the
+    caller (per-row fill or the vectorized fast path).
     """
 
-    md_filled = body_template.format(**row)
+    plain_body = body
+    html_body = _md_to_html(body)  # converts to <p>, <strong>, <em>, links…
 
-    plain_body = md_filled
-    html_body = markdown2.markdown(md_filled)  # converts to <p>, <strong>, <em>, links…
+    attach_blob = b""
+    if attachments:
+        resolved = []
+        for tpl in attachments:
+            fp = Path(tpl.format(**row))  # expand placeholders
+            if not fp.is_file():
+                print(f"⚠️  attachment {fp} not found – skipping")
+                continue
+            resolved.append(str(fp.resolve()))
+        if resolved:
+            attach_blob = _attach_blob(tuple(resolved))
 
-    msg = EmailMessage()
-    msg["To"] = row["email"]
-    msg["From"] = sender
-    msg["Subject"] = subject_fmt.format(**row)
+    raw = build_mime(
+        row["email"],
+        sender,
+        subject,
+        plain_body,
+        html_body,
+        attach_blob,
+    )
+    # Gmail accepts unpadded urlsafe base64
+    encoded = base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+    return {"raw": encoded}
 
-    # *multipart/alternative*: first part = plain, second part = html
-    msg.set_content(plain_body)
-    msg.add_alternative(html_body, subtype="html")
 
-    if attachments:
-        _attach_files(msg, attachments, row)
+def _flush_lines(lines: list[str]) -> None:
+    """
+    Emit buffered progress in one write.
 
-    encoded = base64.urlsafe_b64encode(msg.as_bytes()).decode("utf-8")
-    return {"raw": encoded}
+    Per-message print() calls grab the stdout lock and hit the TTY every
+    row, which becomes a contention point under concurrency; one write
+    per chunk keeps the loop off the terminal.
+    """
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+
+# orjson skips CPython's per-byte escape scan, which matters when the
+# payload is megabytes of base64; plain json works fine without it
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+
+def send_message(session: AuthorizedSession, message: dict):
+    """
+    Send one message over the pooled session via the REST endpoint.
+    """
+    resp = session.post(
+        GMAIL_SEND_URL,
+        data=_dumps(message),
+        headers={"Content-Type": "application/json"},
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _is_throttle(e: requests.HTTPError) -> bool:
+    status = e.response.status_code
+    if status == 429:
+        return True
+    if status == 403:
+        return "rateLimitExceeded" in e.response.text or "quotaExceeded" in e.response.text
+    return False
+
+
+def _is_throttle_batch(e) -> bool:
+    """Throttle classification for googleapiclient's HttpError."""
+    if e.resp.status == 429:
+        return True
+    if e.resp.status == 403:
+        body = e.content.decode("utf-8", errors="replace")
+        return "rateLimitExceeded" in body or "quotaExceeded" in body
+    return False
+
+
+def send_with_retry(session: AuthorizedSession, message: dict, max_attempts: int = 5):
+    """
+    Send one message, retrying throttled requests with exponential backoff.
+
+    429 and 403 rate/quota errors are retried (base 1 s, doubling, capped
+    at 60 s, plus jitter), honoring a Retry-After header when Gmail sends
+    one. Anything else propagates immediately.
+    """
+    import requests
+
+    for attempt in range(max_attempts):
+        _bucket.acquire(SEND_QUOTA_UNITS)
+        try:
+            return send_message(session, message)
+        except requests.HTTPError as e:
+            if not _is_throttle(e) or attempt == max_attempts - 1:
+                raise
+            wait = min(60, 2**attempt) + random.random()
+            retry_after = e.response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    wait = max(wait, float(retry_after))
+                except ValueError:
+                    pass
+            time.sleep(wait)
+
+
+async def send_concurrent(session: AuthorizedSession, entries: list[tuple[str, dict]], concurrency: int):
+    """
+    Send messages concurrently, at most ``concurrency`` in flight.
+
+    The session is synchronous, so each send runs in the default
+    executor; the semaphore keeps us from opening an unbounded number
+    of connections while still overlapping round-trip latency.
+    """
+    import requests
+
+    sem = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    lines: list[str] = []  # appended on the event-loop thread only
+
+    async def send_one(email: str, message: dict):
+        async with sem:
+            try:
+                await loop.run_in_executor(None, send_with_retry, session, message)
+                lines.append(f"✓ Sent to {email}")
+            except requests.RequestException as e:
+                lines.append(f"‼️  Error sending to {email}: {e}")
+
+    await asyncio.gather(*(send_one(email, msg) for email, msg in entries))
+    _flush_lines(lines)
 
 
-def send_message(service, message):
+def send_batch(service, session, entries: list[tuple[str, dict]], concurrency: int = 10):
     """
-    Send one message with the Gmail API.
+    Send up to BATCH_SIZE messages in a single multipart batch call.
+
+    ``entries`` is a list of ``(email, message)`` pairs. One round trip
+    covers the whole chunk; if the server rejects batching outright we
+    fall back to concurrent per-message sends.
     """
-    return service.users().messages().send(userId="me", body=message).execute()
+    from googleapiclient.errors import HttpError
+
+    emails = {str(i): email for i, (email, _) in enumerate(entries)}
+    lines: list[str] = []
+    throttled: list[tuple[str, dict]] = []
+
+    def on_sent(request_id, response, exception):
+        email = emails[request_id]
+        if exception is None:
+            lines.append(f"✓ Sent to {email}")
+        elif isinstance(exception, HttpError) and _is_throttle_batch(exception):
+            # transient quota throttle – don't drop the row, requeue it
+            throttled.append(entries[int(request_id)])
+        else:
+            lines.append(f"‼️  Error sending to {email}: {exception}")
+
+    batch = service.new_batch_http_request(callback=on_sent)
+    # resolve the users().messages().send chain once, not per message
+    send_fn = service.users().messages().send
+    for i, (_, message) in enumerate(entries):
+        batch.add(send_fn(userId="me", body=message), request_id=str(i))
+
+    # pace the whole chunk up front – without this every batch after the
+    # first lands straight in 429 territory
+    _bucket.acquire(len(entries) * SEND_QUOTA_UNITS)
+    try:
+        batch.execute()
+    except HttpError as e:
+        # some endpoints reject batching with a 400 – degrade gracefully
+        if e.resp.status == 400 and b"batch" in e.content.lower():
+            asyncio.run(send_concurrent(session, entries, concurrency))
+            return
+        if _is_throttle_batch(e) or e.resp.status >= 500:
+            # transient top-level failure – retry the chunk through the
+            # paced per-message path
+            asyncio.run(send_concurrent(session, entries, concurrency))
+            return
+        # anything else: report this chunk and keep the merge going
+        lines = [f"‼️  Error sending to {email}: {e}" for email, _ in entries]
+    _flush_lines(lines)
+
+    if throttled:
+        # retry throttled rows through the paced, backoff-retrying
+        # single-send path instead of losing them
+        asyncio.run(send_concurrent(session, throttled, concurrency))
 
 
 def main():
@@ -114,32 +627,133 @@ def main():
         metavar="PATH",
         help="Path(s) to file(s) to attach. Placeholders like {name}.pdf are allowed.",
     )
+    ap.add_argument(
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Max in-flight requests when batching is unavailable",
+    )
+    ap.add_argument(
+        "--fast",
+        action="store_true",
+        help="Vectorize CSV loading and template filling with pyarrow",
+    )
+    ap.add_argument(
+        "--no-count",
+        action="store_true",
+        help="Skip the row-count pass over the CSV (for huge files)",
+    )
+    ap.add_argument(
+        "--sender-pool",
+        type=pathlib.Path,
+        metavar="SENDERS_JSON",
+        help='JSON mapping "Name <addr@example.com>" → token.json path; '
+        "shards rows across the senders in parallel processes",
+    )
     ap.add_argument("--dry-run", action="store_true", help="Just print; don’t send")
     args = ap.parse_args()
 
-    body_template = args.template.read_text()
-    rows = list(csv.DictReader(args.csv.open()))
+    if args.sender_pool:
+        senders = json.loads(args.sender_pool.read_text())
+        jobs = [
+            (args, sender, token_path, k, len(senders))
+            for k, (sender, token_path) in enumerate(senders.items())
+        ]
+        with multiprocessing.Pool(len(senders)) as pool:
+            pool.starmap(_run_shard, jobs)
+        return
+
+    run_merge(args)
+
+
+def _run_shard(args, sender: str, token_path: str, shard: int, nshards: int):
+    """
+    Entry point for one sender-pool worker process.
+
+    Each worker authenticates as its own user with its own token file,
+    so every shard gets a full 250 quota-units/s budget of its own.
+    """
+    global TOKEN_PATH
+    TOKEN_PATH = token_path
+    args.sender = sender
+    run_merge(args, shard=shard, nshards=nshards)
+
+
+def _shard_of(email: str, nshards: int) -> int:
+    """Stable shard assignment – hash() is salted per process."""
+    return zlib.crc32(email.encode()) % nshards
+
+
+def run_merge(args, shard: int = 0, nshards: int = 1):
+    """
+    Run the merge for one sender, optionally restricted to the rows in
+    ``shard`` of ``nshards``.
+    """
+    body_parts = compile_template(args.template.read_text())
+    subject_parts = compile_template(args.subject)
+    # most merges personalize the body, not the subject – resolve a
+    # placeholder-free subject once instead of formatting it per row
+    const_subject = None if has_fields(subject_parts) else args.subject
+
+    # stream the CSV instead of materializing every row dict up front;
+    # the count pass is read()-bound and holds O(1) Python objects
+    total = None
+    if not args.no_count:
+        with args.csv.open() as f:
+            total = max(sum(1 for _ in f) - 1, 0)
+
+    # past ~10k rows the per-row Python fill loop dominates; switch to
+    # the Arrow kernels when pyarrow is around
+    row_iter = None
+    if args.fast or (total is not None and total > 10_000):
+        try:
+            row_iter = _iter_rows_fast(args.csv, body_parts)
+        except ImportError:
+            if args.fast:
+                print("⚠️  --fast needs pyarrow; using the row-by-row path")
+        except KeyError as e:
+            print(f"‼️  Missing column {e} in CSV; using the row-by-row path")
+    if row_iter is None:
+        # body filled inside the loop so a missing column skips the row
+        reader = csv.DictReader(args.csv.open(newline=""))
+        row_iter = ((row, None) for row in reader)
 
     service = None if args.dry_run else get_service()
+    session = None if args.dry_run else get_session()
 
-    for i, row in enumerate(rows, start=1):
+    pending: list[tuple[str, dict]] = []
+    for i, (row, body) in enumerate(row_iter, start=1):
+        if nshards > 1 and _shard_of(row.get("email", ""), nshards) != shard:
+            continue
         try:
-            message = message = create_message(
+            if body is None:
+                body = fill(body_parts, row)
+            message = create_message(
                 row,
-                args.subject,
-                body_template,
+                const_subject if const_subject is not None else fill(subject_parts, row),
+                body,
                 args.sender,
                 attachments=args.attach,
             )
-            if args.dry_run:
-                print(f"[DRY‑RUN] Would send to {row['email']}")
-            else:
-                send_message(service, message)
-                print(f"✓ Sent to {row['email']}  ({i}/{len(rows)})")
-        except HttpError as e:
-            print(f"‼️  Error sending to {row['email']}: {e}")
         except KeyError as e:
             print(f"‼️  Missing column {e} in CSV; skipping {row.get('email')}")
+            continue
+        except ValueError as e:
+            print(f"‼️  {e}; skipping {row.get('email')}")
+            continue
+
+        if args.dry_run:
+            of_total = f"  ({i}/{total})" if total is not None else ""
+            print(f"[DRY‑RUN] Would send to {row['email']}{of_total}")
+            continue
+
+        pending.append((row["email"], message))
+        if len(pending) >= BATCH_SIZE:
+            send_batch(service, session, pending, args.concurrency)
+            pending = []
+
+    if pending:
+        send_batch(service, session, pending, args.concurrency)
 
 
 if __name__ == "__main__":
@@ -1,17 +1,42 @@
-import os
 from pathlib import Path
 from typing import Optional
 
+from .main import _md_to_html, compile_template, fill
+
 
 class RichGmailMessageTemplate:
     """
-    Base class for a rich email template.
+    A rich email template backed by a Markdown file.
+
+    The file is read and its {placeholder} structure compiled once at
+    construction, so per-recipient rendering costs one dict lookup per
+    placeholder instead of re-reading and re-lexing the template.
 
     - TODO:
-        1. support for simple keyword fills from a csv
-        2. support for llm fills
+        1. support for llm fills
     """
 
-    def __init__(self, markdown_fp: str, attachments: Optional[list[Path]]) -> None:
+    def __init__(self, markdown_fp: str, attachments: Optional[list[Path]] = None) -> None:
         self.path = Path(markdown_fp)
         assert self.path.exists()
+        self.attachments = attachments or []
+
+        self._raw = self.path.read_text()
+        self._parts = compile_template(self._raw)
+        self._fields = {name for _, name, _, _ in self._parts if name is not None}
+
+    @property
+    def fields(self) -> set[str]:
+        """Placeholder names the template expects from each row."""
+        return self._fields
+
+    def render(self, row: dict) -> tuple[str, str]:
+        """
+        Fill the template with one row's values.
+
+        Returns ``(plain, html)``; the Markdown→HTML conversion is
+        memoized on the filled text (see main._md_to_html), so identical
+        bodies across recipients are converted once.
+        """
+        plain = fill(self._parts, row)
+        return plain, _md_to_html(plain)